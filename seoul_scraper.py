@@ -1,239 +1,537 @@
-import requests
-from bs4 import BeautifulSoup, Tag # Import Tag for type checking
+import argparse # Command-line options
+import asyncio # Import asyncio for concurrent detail downloads
+import contextlib # Close the cache connection on any exit
+import logging # Progress/diagnostic output
+import logging.handlers # Buffered log file writes
+import httpx # Async HTTP client with HTTP/2 support
+from bs4 import BeautifulSoup, NavigableString, Tag # Import Tag for type checking
+from bs4.dammit import EncodingDetector # Finds a page's <meta charset>
+import codecs # Check that a charset name is one Python knows
+import lxml.html # Fast C-level parsing of list pages
+from lxml import etree # Pre-compiled XPath expressions
 import re # Import regex module
-import time # Import time module for delays
+import random # Import random for jittered request start times
 import json # Import json module for saving data
-from urllib.parse import urljoin # To construct absolute URLs
+import os # Check for existing output when resuming
+import textwrap # Indent records when converting JSON Lines to a JSON array
+import sqlite3 # On-disk cache of detail pages
+import time # Timestamps for cache expiry
+from collections import defaultdict # Per-host semaphores, created on first use
+from urllib.parse import urljoin, urlparse # To construct absolute URLs and key requests by host
+from datetime import datetime, timezone # Retry-After given as an HTTP date
+from email.utils import parsedate_to_datetime # Parse HTTP dates
 
-# --- Function to scrape details from an attraction page ---
-def scrape_details(detail_url, session):
-    """Fetches and parses an attraction detail page to extract description and transport info."""
-    print(f"  Scraping details from: {detail_url}")
+BASE_URL = "https://english.visitseoul.net"
+START_URL = urljoin(BASE_URL, "/attractions") # Start at the attractions page
+HEADERS = {'User-Agent': 'Mozilla/5.0 (compatible; MySeoulScraper/1.0; +http://mywebsite.com)'} # More specific user agent
+REQUEST_TIMEOUT = httpx.Timeout(15.0)
+MAX_CONCURRENT_REQUESTS = 4 # Cap on simultaneous requests to any one host (be polite)
+STAGGER_STEP = 0.1 # Seconds between start times of concurrent workers, so requests don't fire in one burst
+POLITE_DELAY = 1.5 # Seconds each request keeps its host slot after completing (caps a host at ~MAX_CONCURRENT_REQUESTS / POLITE_DELAY req/s)
+RETRY_TOTAL = 3 # Extra attempts for transient failures before giving up on a URL
+RETRY_BACKOFF_FACTOR = 0.3 # Backoff before retry n is factor * 2**(n-1) seconds (0.3s, 0.6s, 1.2s)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504} # HTTP statuses worth retrying
+# Transport errors worth retrying; others (e.g. UnsupportedProtocol for a javascript: href) fail immediately
+TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+CACHE_FILE = 'seoul_cache.sqlite' # Detail pages are cached here so re-runs don't re-download the site
+CACHE_EXPIRE_AFTER = 86400 # Seconds before a cached detail page is fetched again (1 day)
+OUTPUT_JSONL = 'seoul_attractions.jsonl' # Records are appended here as they are scraped (one JSON object per line)
+OUTPUT_JSON = 'seoul_attractions.json' # Final JSON array, converted from OUTPUT_JSONL at the end of a run
+LOG_FILE = 'scrape.log' # Full per-item log; the console only shows page-level progress unless --verbose
+LOG_BUFFER_RECORDS = 500 # Log records buffered in memory before being written to LOG_FILE
+
+logger = logging.getLogger('seoul')
+
+# --- Pre-compiled patterns (compiled once at import rather than on every page/item) ---
+# ** Placeholders - Adjust alongside the selectors they are used with **
+DESC_CLASS_RE = re.compile(r'cont-in-box|content|desc|summary|article', re.I)
+TRANSPORT_HEADING_RE = re.compile(r'Transportation|Getting Here|Directions|Access', re.I)
+# Bytes pattern searched on the raw page body. Word boundaries rule out words that merely contain a keyword
+# (aria-busy, business), but whole-word keywords in markup such as class="bus-icon" still match
+TRANSPORT_KW_RE = re.compile(rb'\b(?:Subways?|Bus(?:es)?|Stations?|Line \d+)\b', re.I)
+
+# --- Pre-compiled XPath expressions for list pages (compiled once, reused on every page) ---
+# Matching text 'Next' case-insensitively: translate() lower-cases just the letters of 'next'
+_HAS_NEXT_TEXT = "contains(translate(normalize-space(.), 'NEXT', 'next'), 'next')"
+# A matching <div> container is preferred over a matching <ul>, wherever each sits in the document
+LIST_CONTAINER_DIV_XPATH = etree.XPath("(//div[contains(@class, 'list-container') or contains(@class, 'items-wrap') or contains(@class, 'attraction-items')])[1]")
+LIST_CONTAINER_UL_XPATH = etree.XPath("(//ul[contains(@class, 'card-list') or contains(@class, 'item-list')])[1]")
+# Fallback cards: any <li>/<div> carrying one of these exact class tokens, found in a single pass
+WANTED_CLASSES = frozenset(('item', 'card', 'list-item', 'attraction-item'))
+_IS_CARD = "(self::li or self::div) and (%s)" % ' or '.join(
+    f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')" for cls in sorted(WANTED_CLASSES))
+CARD_XPATH = etree.XPath(f"//*[{_IS_CARD}]")
+NAME_XPATH = etree.XPath("(.//strong[contains(@class, 'title') or contains(@class, 'name')])[1]")
+# Visible text only: text() skips comments, and script/style contents are excluded as get_text() did
+NAME_TEXT_XPATH = etree.XPath(".//text()[not(ancestor::script or ancestor::style)]")
+PAGINATION_XPATH = etree.XPath("(//div[contains(@class, 'pagination') or contains(@class, 'paging')])[1]")
+NEXT_TEXT_XPATH = etree.XPath(f".//a[@href][{_HAS_NEXT_TEXT}]/@href")
+NEXT_CLASS_XPATH = etree.XPath(".//a[@href][contains(@class, 'next') or contains(@class, 'forward')]/@href")
+NEXT_BUTTON_XPATH = etree.XPath(f"//a[@href][contains(@class, 'btn') or contains(@class, 'page')][{_HAS_NEXT_TEXT}]/@href")
+
+# --- Function to read a server's requested retry delay ---
+def retry_after_seconds(response):
+    """Returns the delay requested by the Retry-After header (seconds or HTTP date), or 0 if absent or invalid."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+# --- Function to fetch a page, retrying transient errors ---
+async def fetch_page(url, client, host_sems):
+    """Fetches a URL and returns (raw body bytes, charset from the Content-Type header or None).
+
+    Transient connection errors and retryable statuses are retried with backoff, waiting at least as long as
+    any Retry-After header asks. The body is left undecoded so the
+    parser can use the declared charset (or the page's <meta charset>) instead of guessing.
+    host_sems maps a host to the semaphore that caps concurrent requests to it.
+    """
+    retry_after = 0.0
+    for attempt in range(RETRY_TOTAL + 1):
+        if attempt:
+            # Back off, but never retry sooner than the server asked for
+            await asyncio.sleep(max(RETRY_BACKOFF_FACTOR * (2 ** (attempt - 1)), retry_after))
+            retry_after = 0.0
+        try:
+            host_sem = host_sems[urlparse(url).netloc]
+            await host_sem.acquire()
+            try:
+                response = await client.get(url)
+            finally:
+                # Keep the host slot busy for the polite delay, but release it in the background so this
+                # task can go on parsing meanwhile; requests to other hosts are never held up by it
+                asyncio.get_running_loop().call_later(POLITE_DELAY, host_sem.release)
+            if response.status_code in RETRY_STATUS_CODES and attempt < RETRY_TOTAL:
+                retry_after = retry_after_seconds(response)
+                logger.warning("Got HTTP %s from %s, retrying (%d/%d)...", response.status_code, url, attempt + 1, RETRY_TOTAL)
+                continue
+            response.raise_for_status()
+            return response.content, response.charset_encoding
+        except TRANSIENT_ERRORS as e: # Connection errors and timeouts
+            if attempt == RETRY_TOTAL:
+                raise
+            logger.warning("Error fetching %s: %s, retrying (%d/%d)...", url, e, attempt + 1, RETRY_TOTAL)
+
+# --- Function to choose how to decode a page ---
+def page_encoding(content, declared):
+    """Returns the charset to decode content with: the header's if Python knows it, else the page's
+    <meta charset>, else UTF-8 (libxml2 would otherwise guess Latin-1)."""
+    for candidate in (declared, EncodingDetector.find_declared_encoding(content, is_html=True)):
+        if candidate:
+            try:
+                codecs.lookup(candidate)
+                return candidate
+            except LookupError:
+                continue # Unknown or bogus name; try the next source
+    return 'utf-8'
+
+# --- Functions for the on-disk page cache ---
+def open_cache(path):
+    """Opens (creating if needed) the SQLite page cache and returns its connection."""
+    cache = sqlite3.connect(path)
+    cache.execute('CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, body BLOB NOT NULL, encoding TEXT, fetched_at REAL NOT NULL)')
+    return cache
+
+def cache_get(cache, url):
+    """Returns the cached (body, encoding) for url, or None if it is missing or older than CACHE_EXPIRE_AFTER."""
+    row = cache.execute('SELECT body, encoding, fetched_at FROM responses WHERE url = ?', (url,)).fetchone()
+    if row and time.time() - row[2] < CACHE_EXPIRE_AFTER:
+        return row[0], row[1]
+    return None
+
+def cache_put(cache, url, body, encoding):
+    """Stores a successfully fetched body (raw bytes) and its declared encoding for url."""
+    cache.execute('INSERT OR REPLACE INTO responses (url, body, encoding, fetched_at) VALUES (?, ?, ?, ?)',
+                  (url, body, encoding, time.time()))
+    cache.commit()
+
+# --- Functions for incremental output ---
+def load_scraped_links(path):
+    """Returns the set of detail links already saved in the JSON Lines output, so a rerun can resume."""
+    links = set()
+    if not os.path.exists(path):
+        return links
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                links.add(json.loads(line)['link'])
+            except (ValueError, KeyError):
+                continue # Skip blank or partially written lines (e.g. from a crash mid-write)
+    return links
+
+def open_output_for_append(path):
+    """Opens the JSON Lines output for appending, first ending a partial last line left by a crash mid-write."""
+    if os.path.exists(path) and os.path.getsize(path):
+        with open(path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.seek(0, os.SEEK_END)
+                f.write(b'\n') # Keep the next record off the broken line so only the partial one is dropped
+    return open(path, 'a', encoding='utf-8')
+
+def jsonl_to_json(jsonl_path, json_path):
+    """Converts the JSON Lines output into a JSON array one record at a time and returns the record count."""
+    count = 0
+    with open(jsonl_path, encoding='utf-8') as src, open(json_path, 'w', encoding='utf-8') as dst:
+        dst.write('[')
+        for line in src:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            dst.write(',\n' if count else '\n')
+            dst.write(textwrap.indent(json.dumps(record, ensure_ascii=False, indent=4), '    '))
+            count += 1
+        dst.write('\n]' if count else ']')
+    return count
+
+# --- Function to flatten a content block to text ---
+def block_text(tag):
+    """Returns the block's non-blank text nodes, stripped, one per line.
+
+    Same output as get_text(separator='\\n', strip=True), but walks the descendants directly instead of going
+    through BS4's per-string type filtering; comments, CDATA and script/style strings are NavigableString
+    subclasses, so the exact type check skips them just as get_text does.
+    """
+    lines = []
+    for node in tag.descendants:
+        if type(node) is NavigableString:
+            text = node.strip()
+            if text:
+                lines.append(text)
+    return '\n'.join(lines)
+
+# --- Function to parse an attraction detail page ---
+def parse_details(content, encoding):
+    """Parses attraction detail page bytes and returns (description, transport).
+
+    This is CPU-bound, so scrape_details runs it in a worker thread to keep the event loop free.
+    """
     description = "Description not found"
     transport = "Transportation info not found"
+    detail_soup = BeautifulSoup(content, 'lxml', from_encoding=page_encoding(content, encoding))
+
+    # --- Extract Description ---
+    # ** Placeholder - Replace with actual selector identified by inspecting the detail page HTML **
+    # Example guesses (likely need adjustment):
+    # desc_area = detail_soup.find('div', class_='article-content')
+    # desc_area = detail_soup.find('section', id='description-section')
+    desc_area = detail_soup.find('div', class_=DESC_CLASS_RE)
+    if desc_area:
+        # Remove potential script/style tags within the description area
+        for unwanted_tag in desc_area.find_all(['script', 'style']):
+            unwanted_tag.extract()
+        description = block_text(desc_area)
+    else:
+        # Fallback: find the main content area (often <main> or div#content)
+        main_content = detail_soup.find('main') or detail_soup.find('div', id='content')
+        if main_content:
+            first_paragraph = main_content.find('p')
+            description = first_paragraph.get_text(strip=True) if first_paragraph else "Main content found, but no <p> tag."
+
+    # --- Extract Transportation ---
+    # ** Placeholder - Replace with actual selector identified by inspecting the detail page HTML **
+    # Example guesses:
+    # transport_section = detail_soup.find('section', id='transport-info')
+    # transport_heading = detail_soup.find(['h2', 'h3'], string=re.compile(r'Transportation|Access', re.I))
+    transport_heading = detail_soup.find(['h2', 'h3', 'h4'], string=TRANSPORT_HEADING_RE)
+    if transport_heading:
+        heading_text = transport_heading.string.strip()
+        # Walk forward from the heading in document order and take the first content block (e.g. div, p, ul).
+        # This covers both the next sibling and, when the heading is wrapped, the parent's next sibling in one pass
+        transport = f"Found heading '{heading_text}', but couldn't find subsequent content."
+        for element in transport_heading.next_elements:
+            if isinstance(element, Tag) and element.name in ('div', 'p', 'ul', 'section'):
+                transport = block_text(element)
+                break
+    else:
+        # Fallback: Search for keywords in the whole page (less reliable)
+        # Scan the raw bytes we already have rather than serializing the whole parsed tree to text
+        if TRANSPORT_KW_RE.search(content):
+             transport = "Found transport keywords, but couldn't isolate section."
+
+    return description, transport
+
+# --- Function to scrape details from an attraction page ---
+async def scrape_details(detail_url, client, host_sems, cache, stagger=0.0):
+    """Fetches (or loads from cache) and parses an attraction detail page to extract description and transport info.
+
+    Returns (description, transport), or None if the page could not be fetched or parsed.
+    """
     try:
-        # Use the session object for the request
-        response = session.get(detail_url, timeout=15)
-        response.raise_for_status()
-        detail_soup = BeautifulSoup(response.text, 'html.parser')
-
-        # --- Extract Description ---
-        # ** Placeholder - Replace with actual selector identified by inspecting the detail page HTML **
-        # Example guesses (likely need adjustment):
-        # desc_area = detail_soup.find('div', class_='article-content')
-        # desc_area = detail_soup.find('section', id='description-section')
-        desc_area = detail_soup.find('div', class_=re.compile(r'cont-in-box|content|desc|summary|article', re.I))
-        if desc_area:
-            # Remove potential script/style tags within the description area
-            for unwanted_tag in desc_area.find_all(['script', 'style']):
-                unwanted_tag.extract()
-            description = desc_area.get_text(separator='\n', strip=True)
-        else:
-            # Fallback: find the main content area (often <main> or div#content)
-            main_content = detail_soup.find('main') or detail_soup.find('div', id='content')
-            if main_content:
-                description = main_content.find('p').get_text(strip=True) if main_content.find('p') else "Main content found, but no <p> tag."
-
-        # --- Extract Transportation ---
-        # ** Placeholder - Replace with actual selector identified by inspecting the detail page HTML **
-        # Example guesses:
-        # transport_section = detail_soup.find('section', id='transport-info')
-        # transport_heading = detail_soup.find(['h2', 'h3'], string=re.compile(r'Transportation|Access', re.I))
-        transport_heading = detail_soup.find(['h2', 'h3', 'h4'], string=re.compile(r'Transportation|Getting Here|Directions|Access', re.I))
-        if transport_heading:
-            # Try to find the content block immediately following the heading
-            # This is highly dependent on structure (e.g., next sibling, parent's next sibling, specific div)
-            next_element = transport_heading.find_next_sibling()
-            if next_element and isinstance(next_element, Tag):
-                # Check if the next sibling seems like a content block (e.g., div, p, ul)
-                if next_element.name in ['div', 'p', 'ul', 'section']:
-                    transport = next_element.get_text(separator='\n', strip=True)
-                else: # Maybe the content is further down or nested differently
-                    transport = f"Found heading '{transport_heading.string.strip()}', but next sibling structure unclear."
-            else:
-                 # If no direct sibling, try finding the parent's next content sibling
-                 parent_next = transport_heading.find_parent().find_next_sibling()
-                 if parent_next and isinstance(parent_next, Tag):
-                      transport = parent_next.get_text(separator='\n', strip=True)
-                 else:
-                      transport = f"Found heading '{transport_heading.string.strip()}', but couldn't find subsequent content."
+        cached = cache_get(cache, detail_url)
+        if cached is not None:
+            content, encoding = cached
+            logger.debug("  Using cached details for: %s", detail_url)
         else:
-            # Fallback: Search for keywords in the whole page (less reliable)
-            all_text = detail_soup.get_text(" ", strip=True)
-            if re.search(r'(Subway|Bus|Station|Line [0-9])', all_text, re.I):
-                 transport = "Found transport keywords, but couldn't isolate section."
-
-    except requests.exceptions.RequestException as e:
-        print(f"    Error fetching detail URL {detail_url}: {e}")
-        description = f"Error fetching page: {e}"
-        transport = f"Error fetching page: {e}"
+            # Stagger start times (plus a little jitter) so concurrent workers don't hit the host in lockstep
+            await asyncio.sleep(stagger + random.uniform(0, STAGGER_STEP))
+            logger.debug("  Scraping details from: %s", detail_url)
+            # Use the shared client; fetch_page waits for a free slot on the detail page's host
+            content, encoding = await fetch_page(detail_url, client, host_sems)
+            cache_put(cache, detail_url, content, encoding)
+        # Parse in a thread so other pages' network I/O keeps overlapping with this CPU work
+        description, transport = await asyncio.to_thread(parse_details, content, encoding)
+
+    except httpx.HTTPError as e:
+        logger.error("Error fetching detail URL %s: %s", detail_url, e)
+        return None
     except Exception as e:
-        print(f"    Error parsing detail URL {detail_url}: {e}")
-        description = f"Error parsing page: {e}"
-        transport = f"Error parsing page: {e}"
+        logger.error("Error parsing detail URL %s: %s", detail_url, e)
+        return None
 
-    # Clean up potentially long descriptions for printing
+    # Clean up potentially long descriptions for output
     if len(description) > 300:
         description = description[:300].strip() + "... (truncated)"
 
     return description.strip(), transport.strip()
 
-# --- Main Script Logic ---
-BASE_URL = "https://english.visitseoul.net"
-START_URL = urljoin(BASE_URL, "/attractions") # Start at the attractions page
-all_attraction_data = []
-processed_urls = set() # Keep track of visited list pages to avoid loops
-# MAX_PAGES = 10 # Safety limit to prevent infinite loops - REMOVED as requested
+# --- Function to extract name and link from a list item ---
+def parse_item(item_tag):
+    """Extracts (name, link) from a single list item element; link is None if the item has no href."""
+    name = "Name not found"
+    link = None
+    # ** Placeholder - Replace with actual name selector within the item **
+    name_tag = item_tag.find('.//h3')
+    if name_tag is None:
+        name_tag = next(iter(NAME_XPATH(item_tag)), None)
+    if name_tag is None:
+        name_tag = item_tag.find('.//a') # Fallback
 
-# Use a session object for connection pooling and potential cookie handling
-session = requests.Session()
-session.headers.update({'User-Agent': 'Mozilla/5.0 (compatible; MySeoulScraper/1.0; +http://mywebsite.com)'}) # More specific user agent
+    if name_tag is not None:
+        name = ''.join(text.strip() for text in NAME_TEXT_XPATH(name_tag)) # Simpler extraction for now
 
-current_url = START_URL
-page_count = 0
+    # ** Placeholder - Replace with actual link selector within the item **
+    link_tag = item_tag.find('.//a[@href]')
+    if link_tag is not None:
+        link_href = link_tag.get('href')
+        link = urljoin(BASE_URL, link_href) # Construct absolute URL
 
-print(f"Starting scraper at: {START_URL}")
+    return name, link
 
-while current_url: # Removed 'and page_count < MAX_PAGES'
-    if current_url in processed_urls:
-        print(f"Already processed {current_url}, stopping pagination loop.")
-        break
+# --- Function to find the next list page ---
+def find_next_page_url(tree):
+    """Returns the absolute URL of the 'Next' pagination link, or None if there is none."""
+    next_hrefs = []
+    # ** Placeholder - Replace with actual selector for the 'Next' pagination link **
+    # Try common patterns for pagination links
+    pagination_area = PAGINATION_XPATH(tree)
+    if pagination_area:
+         next_hrefs = NEXT_TEXT_XPATH(pagination_area[0]) or NEXT_CLASS_XPATH(pagination_area[0])
+    # Fallback if no specific pagination area found
+    if not next_hrefs:
+         next_hrefs = NEXT_BUTTON_XPATH(tree)
 
-    print(f"\nFetching list page {page_count + 1}: {current_url}")
-    processed_urls.add(current_url)
-    page_count += 1
+    if next_hrefs:
+        return urljoin(BASE_URL, next_hrefs[0]) # Make absolute URL
+    return None
 
+# --- Function to scrape a list page ---
+async def scrape_list_page(url, client, host_sems):
+    """Fetches a list page and returns its items as (name, link) pairs plus the next page URL (or None)."""
+    content, encoding = await fetch_page(url, client, host_sems)
+    # Parse the raw bytes off the event loop, decoded the same way as detail pages
     try:
-        response = session.get(current_url, timeout=15)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        print(f"Successfully fetched and parsed: {current_url}")
+        parser = lxml.html.HTMLParser(encoding=page_encoding(content, encoding))
+        tree = await asyncio.to_thread(lxml.html.fromstring, content, parser=parser)
+    except Exception as e: # e.g. lxml's ParserError "Document is empty" for a blank page
+        logger.error("Could not parse list page %s: %s", url, e)
+        return [], None # No items and nothing to follow from an unparseable page
+    logger.debug("Successfully fetched and parsed: %s", url)
 
+    items = []
+    try:
         # --- Find Attraction List Items ---
         # ** Placeholder - Replace with actual selector for the list container **
         # Example Guesses:
-        # list_container = soup.find('div', class_='attraction-list-area')
-        # list_container = soup.find('ul', id='item-results')
-        list_container = soup.find('div', {'class': re.compile(r'list-container|items-wrap|attraction-items', re.I)}) or soup.find('ul', {'class': re.compile(r'card-list|item-list', re.I)})
+        # list_container = tree.find(".//div[@class='attraction-list-area']")
+        # list_container = tree.find(".//ul[@id='item-results']")
+        list_containers = LIST_CONTAINER_DIV_XPATH(tree) or LIST_CONTAINER_UL_XPATH(tree)
 
-        if not list_container:
-             print(f"  Warning: Could not find specific list container on {current_url}. Searching all 'li' or 'div.card'...")
+        if not list_containers:
+             logger.warning("Could not find specific list container on %s. Searching all 'li' or 'div.card'...", url)
              # Fallback: Look for list items more broadly (less reliable)
              # ** Placeholder - Replace with actual selector for individual items **
-             attraction_items = soup.find_all('li', {'class': re.compile(r'item|card', re.I)}) or soup.find_all('div', {'class': re.compile(r'card|list-item', re.I)})
+             cards = CARD_XPATH(tree)
+             # Prefer <li> cards and fall back to <div> cards only when there are none, as before:
+             # a <div class="card"> panel often wraps the real <li class="item"> list
+             attraction_items = [card for card in cards if card.tag == 'li'] or cards
         else:
-             print(f"  Found list container: <{list_container.name} class='{list_container.get('class', '')}'>")
+             list_container = list_containers[0]
+             logger.debug("  Found list container: <%s class='%s'>", list_container.tag, list_container.get('class', ''))
              # ** Placeholder - Replace with actual selector for items *within* the container **
-             attraction_items = list_container.find_all('li', recursive=False) or list_container.find_all('div', recursive=False) # Find direct children li or div
+             attraction_items = list_container.findall('li') or list_container.findall('div') # Find direct children li or div
 
-        if not attraction_items:
-             print(f"  Could not find any attraction items on this page.")
-             # Attempt to find next page even if no items found on current page
-        else:
-            print(f"  Found {len(attraction_items)} potential attraction items on this page.")
-            item_count_on_page = 0
-            for item in attraction_items:
-                item_count_on_page += 1
-                print(f"\n--- Processing Item {item_count_on_page} on Page {page_count} --- ")
-
-                # --- Extract Name and Link from List Item ---
-                name = "Name not found"
-                link = None
-                # ** Placeholder - Replace with actual name selector within the item **
-                name_tag = item.find('h3') or item.find('strong', class_=re.compile(r'title|name', re.I))
-                if not name_tag:
-                    name_tag = item.find('a') # Fallback
-
-                if name_tag:
-                    name = name_tag.get_text(strip=True) # Simpler extraction for now
-
-                # ** Placeholder - Replace with actual link selector within the item **
-                link_tag = item.find('a', href=True)
-                if link_tag:
-                    link_href = link_tag['href']
-                    link = urljoin(BASE_URL, link_href) # Construct absolute URL
-
-                print(f"Name: {name}")
-                print(f"Link: {link}")
-
-                # --- Scrape Details if Link is Valid ---
-                if link and link.startswith(BASE_URL): # Only scrape details from the same site
-                    description, transport = scrape_details(link, session)
-                    print(f"Description: {description}")
-                    print(f"Transportation: {transport}")
-
-                    # Store data
-                    all_attraction_data.append({
-                        'page': page_count,
-                        'name': name,
-                        'link': link,
-                        'description': description,
-                        'transport': transport
-                    })
-                elif link:
-                    print(f"  Skipping detail scraping (external link or invalid): {link}")
-                else:
-                    print("  Skipping detail scraping (no link found).")
-
-                # --- Polite Delay ---
-                print("  Pausing for 1.5 seconds...")
-                time.sleep(1.5) # Slightly longer delay
-
-        # --- Find Next Page Link --- 
-        next_link_tag = None
-        # ** Placeholder - Replace with actual selector for the 'Next' pagination link **
-        # Try common patterns for pagination links
-        pagination_area = soup.find('div', class_=re.compile(r'pagination|paging', re.I))
-        if pagination_area:
-             next_link_tag = pagination_area.find('a', string=re.compile(r'Next', re.I))
-             if not next_link_tag:
-                  next_link_tag = pagination_area.find('a', {'class': re.compile(r'next|forward', re.I)})
-        # Fallback if no specific pagination area found
-        if not next_link_tag:
-             next_link_tag = soup.find('a', string=re.compile(r'Next', re.I), class_=re.compile(r'btn|page', re.I))
-
-        if next_link_tag and next_link_tag.has_attr('href'):
-            next_href = next_link_tag['href']
-            current_url = urljoin(BASE_URL, next_href) # Make absolute URL
-            print(f"  Found next page link: {current_url}")
+        items = [parse_item(item) for item in attraction_items]
+
+        # --- Find Next Page Link ---
+        next_url = find_next_page_url(tree)
+        if next_url:
+            logger.info("  Found next page link: %s", next_url)
         else:
-            print("  No 'Next' page link found or link invalid. Stopping pagination.")
-            current_url = None # Stop the loop
+            logger.info("  No 'Next' page link found or link invalid. Stopping pagination.")
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching list page {current_url}: {e}")
-        print("Stopping scraper due to network error.")
-        break # Exit pagination loop on error
     except Exception as e:
-        print(f"An unexpected error occurred processing page {current_url}: {e}")
+        logger.error("An unexpected error occurred processing page %s: %s", url, e)
         # Decide whether to continue or stop on other errors
-        print("Attempting to find next page link anyway...")
+        logger.info("Attempting to find next page link anyway...")
         # Try to find next page even after error on current page (may fail)
         try:
-            next_link_tag = soup.find('a', string=re.compile(r'Next', re.I)) # Simplified search after error
-            if next_link_tag and next_link_tag.has_attr('href'):
-                next_href = next_link_tag['href']
-                current_url = urljoin(BASE_URL, next_href)
-                print(f"  Found next page link after error: {current_url}")
+            next_hrefs = NEXT_TEXT_XPATH(tree) # Simplified search after error
+            if next_hrefs:
+                next_url = urljoin(BASE_URL, next_hrefs[0])
+                logger.info("  Found next page link after error: %s", next_url)
             else:
-                 current_url = None
+                 next_url = None
         except:
-             print("Could not find next page link after error.")
-             current_url = None
+             logger.error("Could not find next page link after error.")
+             next_url = None
+
+    return items, next_url
+
+# --- Function to crawl all list pages ---
+async def crawl(start_url):
+    """Follows the paginated list from start_url, appending each new attraction's details to OUTPUT_JSONL.
+
+    Returns (pages processed, new items collected).
+    """
+    items_collected = 0
+    items_failed = 0
+    processed_urls = set() # Keep track of visited list pages to avoid loops
+    # Detail links already scraped or queued, seeded with those saved by a previous (possibly interrupted) run
+    seen_detail_urls = load_scraped_links(OUTPUT_JSONL)
+    if seen_detail_urls:
+        logger.info("Resuming: %d items already saved in %s will be skipped.", len(seen_detail_urls), OUTPUT_JSONL)
+    current_url = start_url
+    page_count = 0
+
+    logger.info("Starting scraper at: %s", start_url)
+
+    # Use a single client for connection pooling; with HTTP/2 all concurrent requests to the site
+    # are multiplexed over one TLS connection instead of paying a handshake per socket
+    limits = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+    # Both are closed even if an unexpected error escapes the loop
+    with contextlib.closing(open_cache(CACHE_FILE)) as cache, open_output_for_append(OUTPUT_JSONL) as out_file:
+        async with httpx.AsyncClient(http2=True, limits=limits, timeout=REQUEST_TIMEOUT, headers=HEADERS, follow_redirects=True) as client:
+            host_sems = defaultdict(lambda: asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)) # One request cap per host
+
+            while current_url:
+                if current_url in processed_urls:
+                    logger.info("Already processed %s, stopping pagination loop.", current_url)
+                    break
+
+                logger.info("Fetching list page %d: %s", page_count + 1, current_url)
+                processed_urls.add(current_url)
+                page_count += 1
 
-# --- End of Loop --- 
-print(f"\n--- Finished scraping. Processed {page_count} pages and collected {len(all_attraction_data)} items. ---")
+                try:
+                    items, next_url = await scrape_list_page(current_url, client, host_sems)
+                except httpx.HTTPError as e:
+                    logger.error("Error fetching list page %s: %s", current_url, e)
+                    logger.error("Stopping scraper due to network error.")
+                    break # Exit pagination loop on error
 
-# --- Save Data to JSON --- 
-if all_attraction_data:
+                if not items:
+                     logger.info("  Could not find any attraction items on this page.")
+                else:
+                    logger.info("  Found %d potential attraction items on this page.", len(items))
+                    items_to_scrape = [] # (name, link) pairs whose details are fetched concurrently below
+                    for item_count_on_page, (name, link) in enumerate(items, start=1):
+                        logger.debug("--- Processing Item %d on Page %d ---", item_count_on_page, page_count)
+                        logger.debug("Name: %s", name)
+                        logger.debug("Link: %s", link)
+
+                        if link in seen_detail_urls:
+                            logger.debug("  Skipping detail scraping (already scraped in this or a previous run).")
+                        elif link and link.startswith(BASE_URL): # Only scrape details from the same site
+                            seen_detail_urls.add(link)
+                            items_to_scrape.append((name, link))
+                        elif link:
+                            logger.debug("  Skipping detail scraping (external link or invalid): %s", link)
+                        else:
+                            logger.debug("  Skipping detail scraping (no link found).")
+
+                    # --- Scrape Details Concurrently ---
+                    results = await asyncio.gather(*[
+                        scrape_details(link, client, host_sems, cache, stagger=(i % MAX_CONCURRENT_REQUESTS) * STAGGER_STEP)
+                        for i, (_, link) in enumerate(items_to_scrape)
+                    ])
+                    for (name, link), result in zip(items_to_scrape, results):
+                        if result is None:
+                            # Not saved, so the link stays out of the resume set and is retried on the next run
+                            items_failed += 1
+                            continue
+                        description, transport = result
+                        logger.debug("Name: %s", name)
+                        logger.debug("Description: %s", description)
+                        logger.debug("Transportation: %s", transport)
+
+                        # Store data (written and flushed immediately so a crash loses nothing already scraped)
+                        record = {
+                            'page': page_count,
+                            'name': name,
+                            'link': link,
+                            'description': description,
+                            'transport': transport
+                        }
+                        out_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+                        out_file.flush()
+                        items_collected += 1
+
+                current_url = next_url # No explicit pause needed: fetch_page already holds each host slot for POLITE_DELAY
+
+    if items_failed:
+        logger.warning("%d items could not be scraped and were not saved; rerun to retry them.", items_failed)
+    return page_count, items_collected
+
+# --- Function to configure log output ---
+def setup_logging(verbose=False):
+    """Sends everything to a buffered LOG_FILE and page-level progress (or everything, if verbose) to the console."""
+    logger.setLevel(logging.DEBUG)
+
+    file_handler = logging.FileHandler(LOG_FILE, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    # Buffer records and write them in batches instead of flushing the file for every per-item line
+    buffered_handler = logging.handlers.MemoryHandler(LOG_BUFFER_RECORDS, flushLevel=logging.WARNING, target=file_handler)
+    logger.addHandler(buffered_handler)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.DEBUG if verbose else logging.INFO)
+    console_handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(console_handler)
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape Seoul tourist attractions from english.visitseoul.net.")
+    parser.add_argument('-v', '--verbose', action='store_true', help="also print per-item details to the console")
+    args = parser.parse_args()
+    setup_logging(args.verbose)
+
+    page_count, items_collected = asyncio.run(crawl(START_URL))
+
+    # --- End of Loop --- 
+    logger.info("--- Finished scraping. Processed %d pages and collected %d new items. ---", page_count, items_collected)
+
+    # --- Save Data to JSON --- 
     try:
-        filename = 'seoul_attractions.json'
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(all_attraction_data, f, ensure_ascii=False, indent=4)
-        print(f"Data saved successfully to {filename}")
+        total_items = jsonl_to_json(OUTPUT_JSONL, OUTPUT_JSON)
+        if total_items:
+            logger.info("Data saved successfully to %s (%d items)", OUTPUT_JSON, total_items)
+        else:
+            logger.info("No data collected to save.")
     except Exception as e:
-        print(f"Error saving data to JSON file: {e}")
-else:
-    print("No data collected to save.")
+        logger.error("Error saving data to JSON file: %s", e)
+
+    logger.info("Scraper finished.")
 
-print("Scraper finished.") 
\ No newline at end of file
+if __name__ == '__main__':
+    main()